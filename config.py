@@ -104,6 +104,10 @@ CHANGELOG_SOURCES = {
 # Combine all sources
 ALL_SOURCES = {**RSS_SOURCES, **WEB_SOURCES, **CHANGELOG_SOURCES}
 
+# All sources partitioned by scraper type
+RSS_CONFIGS = {k: v for k, v in ALL_SOURCES.items() if v.get("type") == "rss"}
+WEB_CONFIGS = {k: v for k, v in ALL_SOURCES.items() if v.get("type") == "web"}
+
 # User-Agent for web requests (important for scraping)
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
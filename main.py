@@ -9,19 +9,26 @@ This script:
 4. Updates state file to track seen entries
 """
 
+import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 from src.state_manager import StateManager
 from src.scrapers.rss_scraper import RSSFeedScraper
 from src.scrapers.web_scraper import WebScraper
+from src.scrapers.session import create_session
+from src.scrapers.rate_limiter import HostRateLimiter
 from src.slack_notifier import SlackNotifier
-from config import ALL_SOURCES
+from config import RSS_CONFIGS, WEB_CONFIGS
 
 
 def main():
     """Main execution function."""
+    # Library modules log through `logging`; show their messages alongside the printed progress
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s", stream=sys.stdout)
+
     print("=" * 60)
     print("AI News Scraper Starting")
     print("=" * 60)
@@ -33,33 +40,46 @@ def main():
         print("Please set this in your GitHub repository secrets")
         sys.exit(1)
 
+    # Several webhooks (e.g. one per channel) can be given as a comma-separated list
+    slack_webhook_urls = [url.strip() for url in slack_webhook_url.split(",") if url.strip()]
+    if not slack_webhook_urls:
+        print("ERROR: SLACK_WEBHOOK_URL environment variable contains no webhook URLs")
+        sys.exit(1)
+
     # Initialize components
-    state_manager = StateManager()
-    rss_scraper = RSSFeedScraper()
-    web_scraper = WebScraper()
-    slack_notifier = SlackNotifier(slack_webhook_url)
+    state_manager = StateManager(max_entries_per_source=200)
+    # Both scrapers share one connection pool and one per-host rate limiter
+    session = create_session()
+    rate_limiter = HostRateLimiter()
+    rss_scraper = RSSFeedScraper(session, rate_limiter)
+    web_scraper = WebScraper(session, rate_limiter)
+    slack_notifier = SlackNotifier(slack_webhook_urls)
 
     all_new_entries = []
+    rss_count = 0
+    web_count = 0
 
-    # Scrape RSS sources
+    # Scrape RSS and web sources at the same time - both are I/O-bound and independent
     print("\n" + "=" * 60)
-    print("Scraping RSS feeds...")
+    print("Scraping RSS feeds and web sources...")
     print("=" * 60)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        rss_future = executor.submit(rss_scraper.scrape_sources, RSS_CONFIGS, state_manager)
+        web_future = executor.submit(web_scraper.scrape_sources, WEB_CONFIGS, state_manager)
+
     try:
-        rss_entries = rss_scraper.scrape_sources(ALL_SOURCES, state_manager)
+        rss_entries = rss_future.result()
         all_new_entries.extend(rss_entries)
+        rss_count = len(rss_entries)
         print(f"\n✓ RSS scraping complete: {len(rss_entries)} new entries")
     except Exception as e:
         print(f"\n✗ Error during RSS scraping: {e}")
-        # Continue with web scraping even if RSS fails
+        # Continue with web results even if RSS fails
 
-    # Scrape web sources
-    print("\n" + "=" * 60)
-    print("Scraping web sources...")
-    print("=" * 60)
     try:
-        web_articles = web_scraper.scrape_sources(ALL_SOURCES, state_manager)
+        web_articles = web_future.result()
         all_new_entries.extend(web_articles)
+        web_count = len(web_articles)
         print(f"\n✓ Web scraping complete: {len(web_articles)} new articles")
     except Exception as e:
         print(f"\n✗ Error during web scraping: {e}")
@@ -70,7 +90,6 @@ def main():
     print("Saving state...")
     print("=" * 60)
     try:
-        state_manager.cleanup_old_entries(max_entries_per_source=200)
         state_manager.save_state()
         print("✓ State saved successfully")
     except Exception as e:
@@ -80,32 +99,33 @@ def main():
     print("\n" + "=" * 60)
     print("Sending updates to Slack...")
     print("=" * 60)
-    if all_new_entries:
-        print(f"Total new entries to send: {len(all_new_entries)}")
-        try:
-            success = slack_notifier.send_updates(all_new_entries)
-            if success:
-                print("✓ Updates sent to Slack successfully")
-            else:
-                print("✗ Failed to send updates to Slack")
-                sys.exit(1)
-        except Exception as e:
-            print(f"✗ Error sending to Slack: {e}")
-            # Try to send error notification
+    with slack_notifier:
+        if all_new_entries:
+            print(f"Total new entries to send: {len(all_new_entries)}")
             try:
-                slack_notifier.send_error_notification(str(e))
-            except:
-                pass
-            sys.exit(1)
-    else:
-        print("No new entries found - skipping Slack notification")
+                success = slack_notifier.send_updates(all_new_entries)
+                if success:
+                    print("✓ Updates sent to Slack successfully")
+                else:
+                    print("✗ Failed to send updates to Slack")
+                    sys.exit(1)
+            except Exception as e:
+                print(f"✗ Error sending to Slack: {e}")
+                # Try to send error notification
+                try:
+                    slack_notifier.send_error_notification(str(e))
+                except:
+                    pass
+                sys.exit(1)
+        else:
+            print("No new entries found - skipping Slack notification")
 
     # Summary
     print("\n" + "=" * 60)
     print("Summary")
     print("=" * 60)
-    print(f"RSS entries: {len([e for e in all_new_entries if hasattr(e, '__class__') and e.__class__.__name__ == 'RSSEntry'])}")
-    print(f"Web articles: {len([e for e in all_new_entries if hasattr(e, '__class__') and e.__class__.__name__ == 'WebArticle'])}")
+    print(f"RSS entries: {rss_count}")
+    print(f"Web articles: {web_count}")
     print(f"Total new entries: {len(all_new_entries)}")
     print("\n✓ AI News Scraper finished successfully")
     print("=" * 60)
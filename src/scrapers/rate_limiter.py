@@ -0,0 +1,47 @@
+"""
+Per-host rate limiting for scrapers.
+"""
+
+import threading
+import time
+from typing import Dict
+
+from config import REQUEST_DELAY
+
+
+class HostRateLimiter:
+    """
+    Spaces out requests to the same host while letting distinct hosts proceed in parallel.
+
+    Each host gets a single-token bucket that refills every `delay` seconds, so
+    the first request to a host goes out immediately and later ones wait only
+    for the remainder of the delay.
+    """
+
+    def __init__(self, delay: float = REQUEST_DELAY):
+        """
+        Initialize rate limiter.
+
+        Args:
+            delay: Minimum number of seconds between requests to the same host
+        """
+        self.delay = delay
+        self.last: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, host: str):
+        """
+        Block until a request to the given host is allowed.
+
+        Args:
+            host: Host name (e.g., urlparse(url).netloc)
+        """
+        with self.lock:
+            now = time.monotonic()
+            last = self.last.get(host)
+            wait = 0.0 if last is None else max(0.0, last + self.delay - now)
+            # Reserve the slot before sleeping so concurrent callers queue up behind it
+            self.last[host] = now + wait
+
+        if wait > 0:
+            time.sleep(wait)
@@ -3,13 +3,61 @@ RSS feed scraper for AI news sources.
 """
 
 import feedparser
-import time
+import html
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import cached_property
+from html.parser import HTMLParser
 from typing import List, Dict, Optional
-from dateutil import parser as date_parser
+from urllib.parse import urlparse
 import requests
 
-from config import USER_AGENT, REQUEST_TIMEOUT, REQUEST_DELAY
+from config import REQUEST_TIMEOUT
+from src.scrapers.rate_limiter import HostRateLimiter
+from src.scrapers.session import create_session
+from src.scrapers.utils import parse_date
+
+# Maximum number of feeds fetched at the same time
+MAX_CONCURRENT_FETCHES = 8
+
+# Minimum total size of feed bodies before parsing is moved to a process pool.
+# feedparser handles roughly 1.5 MB/s and a fresh worker pool costs about 0.3s to
+# start, so below a few MB sequential parsing is faster even with spare cores
+MIN_BYTES_FOR_PROCESS_POOL = 4_000_000
+
+# Parser processes must not be forked: scraping runs alongside other threads whose
+# locks a forked child would inherit mid-hold, so start them from a clean process instead
+PARSE_POOL_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Matches a complete HTML tag
+TAG_RE = re.compile(r'<[a-zA-Z/!][^>]*>')
+
+
+def _parse_feed(body: bytes, response_headers: Dict) -> List:
+    """
+    Parse a downloaded feed and return its entries.
+
+    Module-level so it can run in a worker process; only the entries are
+    returned because the full result may hold unpicklable parser errors.
+    """
+    return feedparser.parse(body, response_headers=response_headers).entries
+
+
+class HTMLStripper(HTMLParser):
+    """Collects the text content of an HTML fragment, dropping all tags."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.text = []
+
+    def handle_data(self, d):
+        self.text.append(d)
+
+    def get_data(self):
+        return ''.join(self.text).strip()
 
 
 class RSSEntry:
@@ -32,6 +80,16 @@ class RSSEntry:
         self.published = published
         self.source = source
 
+    @cached_property
+    def published_str(self) -> str:
+        """Publication date formatted for display, computed once on first use."""
+        return self.published.strftime('%b %d, %Y') if self.published else ""
+
+    @cached_property
+    def short_description(self) -> str:
+        """Description shortened to 200 characters for notifications, computed once on first use."""
+        return self.description[:197] + "..." if len(self.description) > 200 else self.description
+
     def to_dict(self) -> Dict:
         """Convert entry to dictionary format."""
         return {
@@ -53,12 +111,19 @@ class RSSEntry:
 class RSSFeedScraper:
     """Scrapes RSS/Atom feeds for AI news."""
 
-    def __init__(self):
-        """Initialize RSS scraper."""
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': USER_AGENT
-        })
+    def __init__(self, session: Optional[requests.Session] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None):
+        """
+        Initialize RSS scraper.
+
+        Args:
+            session: Optional HTTP session to share with other scrapers
+            rate_limiter: Optional per-host rate limiter to share with other scrapers
+        """
+        self.session = session or create_session()
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        # Entries are built on the thread calling scrape_sources, so one reusable stripper is enough
+        self._stripper = HTMLStripper()
 
     def scrape_feed(self, url: str, source_name: str, etag: str = "", last_modified: str = "") -> tuple[List[RSSEntry], str, str]:
         """
@@ -73,95 +138,119 @@ class RSSFeedScraper:
         Returns:
             Tuple of (entries list, new_etag, new_last_modified)
         """
-        entries = []
-        new_etag = ""
-        new_last_modified = ""
+        body, response_headers, new_etag, new_last_modified = self._fetch_feed(url, etag, last_modified)
+        if body is None:
+            return [], new_etag, new_last_modified
+
+        feed_entries = self._safe_parse(body, response_headers)
+        return self._build_entries(feed_entries, source_name), new_etag, new_last_modified
+
+    def _fetch_feed(self, url: str, etag: str, last_modified: str) -> tuple[Optional[bytes], Dict, str, str]:
+        """
+        Download a feed, using conditional GET when possible.
 
+        Args:
+            url: Feed URL
+            etag: Optional ETag for conditional GET
+            last_modified: Optional Last-Modified for conditional GET
+
+        Returns:
+            Tuple of (body or None if there's nothing to parse, response headers,
+            new_etag, new_last_modified)
+        """
         try:
+            # Be respectful - wait for our turn on this host
+            self.rate_limiter.acquire(urlparse(url).netloc)
+
             print(f"Fetching RSS feed: {url}")
 
-            # Parse feed with conditional GET support
-            feed = feedparser.parse(
-                url,
-                etag=etag if etag else None,
-                modified=last_modified if last_modified else None,
-                agent=USER_AGENT,
-                request_headers={
-                    'User-Agent': USER_AGENT
-                }
-            )
+            # Fetch feed with conditional GET support
+            headers = {}
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+            response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
 
             # Check if feed was modified (304 = not modified)
-            if hasattr(feed, 'status'):
-                if feed.status == 304:
-                    print(f"  Feed not modified since last check (304)")
-                    return entries, etag, last_modified
-                elif feed.status != 200:
-                    print(f"  Warning: Feed returned status {feed.status}")
-
-            # Store new ETag and Last-Modified if available
-            if hasattr(feed, 'etag'):
-                new_etag = feed.etag
-            if hasattr(feed, 'modified'):
-                new_last_modified = feed.modified
-
-            # Parse entries
-            for entry in feed.entries:
-                try:
-                    # Extract title
-                    title = entry.get('title', 'No title')
-
-                    # Extract link
-                    link = entry.get('link', '')
-                    if not link:
-                        # Try alternative link fields
-                        link = entry.get('id', '')
-
-                    # Extract description
-                    description = entry.get('summary', entry.get('description', ''))
-
-                    # Clean HTML tags from description if present
-                    if description:
-                        description = self._clean_html(description)
-                        # Truncate long descriptions
-                        if len(description) > 300:
-                            description = description[:297] + "..."
-
-                    # Extract published date
-                    published = None
-                    if 'published_parsed' in entry and entry.published_parsed:
-                        published = datetime(*entry.published_parsed[:6])
-                    elif 'updated_parsed' in entry and entry.updated_parsed:
-                        published = datetime(*entry.updated_parsed[:6])
-                    elif 'published' in entry:
-                        try:
-                            published = date_parser.parse(entry.published)
-                        except:
-                            pass
-
-                    # Create entry object
-                    rss_entry = RSSEntry(
-                        title=title,
-                        link=link,
-                        description=description,
-                        published=published,
-                        source=source_name
-                    )
-                    entries.append(rss_entry)
-
-                except Exception as e:
-                    print(f"  Warning: Error parsing entry: {e}")
-                    continue
-
-            print(f"  Found {len(entries)} entries")
+            if response.status_code == 304:
+                print(f"  Feed not modified since last check (304)")
+                return None, {}, etag, last_modified
+            elif response.status_code != 200:
+                print(f"  Warning: Feed returned status {response.status_code}")
+
+            # Store new ETag and Last-Modified if available. feedparser looks up
+            # response headers by lowercase name, so normalize them here
+            return (
+                response.content,
+                {name.lower(): value for name, value in response.headers.items()},
+                response.headers.get('ETag', ''),
+                response.headers.get('Last-Modified', '')
+            )
 
         except Exception as e:
             print(f"  Error fetching RSS feed {url}: {e}")
+            return None, {}, "", ""
+
+    def _build_entries(self, feed_entries: List, source_name: str) -> List[RSSEntry]:
+        """
+        Convert parsed feedparser entries into RSSEntry objects.
+
+        Args:
+            feed_entries: Entries from a parsed feed
+            source_name: Name of the source
+
+        Returns:
+            List of RSSEntry objects
+        """
+        entries = []
+
+        # One try around the whole batch; the lookups below use defaults so they don't raise
+        try:
+            for entry in feed_entries:
+                # Extract title
+                title = entry.get('title', 'No title')
+
+                # Extract link
+                link = entry.get('link', '')
+                if not link:
+                    # Try alternative link fields
+                    link = entry.get('id', '')
+
+                # Extract description
+                description = entry.get('summary', entry.get('description', ''))
+
+                # Clean HTML tags from description if present, truncating long ones
+                if description:
+                    description = self._clean_html(description)
+                    description = description[:297] + "..." if len(description) > 300 else description
+
+                # Extract published date
+                published = None
+                published_parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+                if published_parsed:
+                    published = datetime(*published_parsed[:6])
+                elif entry.get('published'):
+                    try:
+                        published = parse_date(entry.get('published'))
+                    except (ValueError, OverflowError):
+                        pass
+
+                # Create entry object
+                entries.append(RSSEntry(
+                    title=title,
+                    link=link,
+                    description=description,
+                    published=published,
+                    source=source_name
+                ))
+
+        except Exception as e:
+            print(f"  Warning: Error parsing entries, skipped {len(feed_entries) - len(entries)}: {e}")
 
-        # Be respectful - add delay between requests
-        time.sleep(REQUEST_DELAY)
+        print(f"  Found {len(entries)} entries from {source_name}")
 
-        return entries, new_etag, new_last_modified
+        return entries
 
     def _clean_html(self, text: str) -> str:
         """
@@ -173,26 +262,20 @@ class RSSFeedScraper:
         Returns:
             Clean text without HTML tags
         """
-        from html.parser import HTMLParser
-
-        class HTMLStripper(HTMLParser):
-            def __init__(self):
-                super().__init__()
-                self.reset()
-                self.strict = False
-                self.convert_charrefs = True
-                self.text = []
-
-            def handle_data(self, d):
-                self.text.append(d)
-
-            def get_data(self):
-                return ''.join(self.text)
-
-        stripper = HTMLStripper()
+        # Summaries are short and simple, so a regex pass is enough for almost all of them
+        stripped = TAG_RE.sub(' ', text)
+        if '<' not in stripped:
+            return ' '.join(html.unescape(stripped).split())
+
+        # A leftover '<' means a tag the regex couldn't match (e.g. truncated markup);
+        # fall back to the real HTML parser for those
+        stripper = self._stripper
         try:
+            stripper.reset()
+            stripper.text.clear()
             stripper.feed(text)
-            return stripper.get_data().strip()
+            stripper.close()
+            return stripper.get_data()
         except:
             # If HTML parsing fails, return original text
             return text
@@ -202,7 +285,7 @@ class RSSFeedScraper:
         Scrape multiple RSS feed sources.
 
         Args:
-            sources: Dictionary of source configurations
+            sources: Dictionary of RSS source configurations (see config.RSS_CONFIGS)
             state_manager: State manager instance for tracking seen entries
 
         Returns:
@@ -210,38 +293,97 @@ class RSSFeedScraper:
         """
         all_new_entries = []
 
+        # Collect every feed to fetch along with its cached ETag and Last-Modified
+        feeds = []
         for source_id, source_config in sources.items():
-            if source_config.get("type") != "rss":
+            for url in source_config["urls"]:
+                state_key = f"{source_id}_{url}"
+                feeds.append((
+                    source_id,
+                    source_config["name"],
+                    url,
+                    state_manager.get_etag(state_key),
+                    state_manager.get_last_modified(state_key)
+                ))
+
+        if not feeds:
+            return all_new_entries
+
+        # Fetch feeds concurrently; the rate limiter keeps requests to the same host spaced out
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_FETCHES, len(feeds))) as executor:
+            fetched = list(executor.map(
+                lambda feed: self._fetch_feed(feed[2], feed[3], feed[4]),
+                feeds
+            ))
+
+        # Parse every downloaded body (CPU-bound, so spread across processes when worthwhile)
+        parsed = self._parse_feeds([(body, response_headers) for body, response_headers, _, _ in fetched])
+
+        # State is updated here in the original source order; StateManager locks its own
+        # access because the web scraper runs alongside this one on another thread
+        for (source_id, source_name, url, _, _), (body, _, new_etag, new_last_modified), feed_entries in zip(feeds, fetched, parsed):
+            # Nothing to do for unchanged (304) or failed feeds
+            if body is None:
                 continue
 
-            source_name = source_config["name"]
+            entries = self._build_entries(feed_entries, source_name)
 
-            for url in source_config["urls"]:
-                # Get cached ETag and Last-Modified
-                etag = state_manager.get_etag(f"{source_id}_{url}")
-                last_modified = state_manager.get_last_modified(f"{source_id}_{url}")
-
-                # Scrape feed
-                entries, new_etag, new_last_modified = self.scrape_feed(
-                    url, source_name, etag, last_modified
-                )
-
-                # Update ETag and Last-Modified in state
-                if new_etag:
-                    state_manager.set_etag(f"{source_id}_{url}", new_etag)
-                if new_last_modified:
-                    state_manager.set_last_modified(f"{source_id}_{url}", new_last_modified)
-
-                # Filter out seen entries
-                new_entries = []
-                for entry in entries:
-                    entry_id = entry.get_id()
-                    if not state_manager.is_seen(source_id, entry_id):
-                        new_entries.append(entry)
-                        state_manager.mark_seen(source_id, entry_id)
-
-                if new_entries:
-                    print(f"  {len(new_entries)} new entries from {source_name}")
-                    all_new_entries.extend(new_entries)
+            # Update ETag and Last-Modified in state
+            if new_etag:
+                state_manager.set_etag(f"{source_id}_{url}", new_etag)
+            if new_last_modified:
+                state_manager.set_last_modified(f"{source_id}_{url}", new_last_modified)
+
+            # Filter out seen entries (the first entry wins for duplicate IDs)
+            entries_by_id = {}
+            for entry in entries:
+                entries_by_id.setdefault(entry.get_id(), entry)
+            new_entries = [entries_by_id[entry_id] for entry_id in state_manager.filter_new(source_id, entries_by_id)]
+
+            if new_entries:
+                print(f"  {len(new_entries)} new entries from {source_name}")
+                all_new_entries.extend(new_entries)
 
         return all_new_entries
+
+    def _parse_feeds(self, bodies: List[tuple[Optional[bytes], Dict]]) -> List[List]:
+        """
+        Parse downloaded feed bodies, in a process pool when there is enough to parse.
+
+        Args:
+            bodies: List of (body, response headers) tuples; a None body yields no entries
+
+        Returns:
+            List with the parsed entries of each feed, in input order
+        """
+        results = [[] for _ in bodies]
+        pending = [i for i, (body, _) in enumerate(bodies) if body is not None]
+
+        # The pool only pays for its startup cost with several cores and a lot of feed data
+        cpu_count = os.cpu_count() or 1
+        total_bytes = sum(len(bodies[i][0]) for i in pending)
+        if cpu_count > 1 and len(pending) > 1 and total_bytes >= MIN_BYTES_FOR_PROCESS_POOL:
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(cpu_count, len(pending)),
+                    mp_context=multiprocessing.get_context(PARSE_POOL_START_METHOD)
+                ) as executor:
+                    parsed = executor.map(_parse_feed, *zip(*(bodies[i] for i in pending)))
+                    for i, feed_entries in zip(pending, parsed):
+                        results[i] = feed_entries
+                return results
+            except Exception as e:
+                print(f"  Warning: Parallel feed parsing failed ({e}), parsing sequentially")
+
+        for i in pending:
+            results[i] = self._safe_parse(*bodies[i])
+
+        return results
+
+    def _safe_parse(self, body: bytes, response_headers: Dict) -> List:
+        """Parse a feed body, returning no entries if parsing fails."""
+        try:
+            return _parse_feed(body, response_headers)
+        except Exception as e:
+            print(f"  Error parsing RSS feed: {e}")
+            return []
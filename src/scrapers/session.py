@@ -0,0 +1,43 @@
+"""
+Shared HTTP session setup for scrapers.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from config import USER_AGENT
+
+
+def create_session() -> requests.Session:
+    """
+    Create a requests session with connection pooling and retries.
+
+    Connections are kept alive and reused across requests to the same host,
+    and transient failures (rate limiting, server errors) are retried with
+    exponential backoff. The same session can be shared by all scrapers.
+
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        # Includes 'br' when the brotli package is installed, which shrinks feeds and pages further
+        'Accept-Encoding': DEFAULT_ACCEPT_ENCODING
+    })
+
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504]
+        )
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
@@ -0,0 +1,31 @@
+"""
+Helpers shared by the scrapers.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+
+from dateutil import parser as date_parser
+
+
+@lru_cache(maxsize=4096)
+def parse_date(date_string: str) -> datetime:
+    """
+    Parse a date string, caching results for repeated strings.
+
+    ISO 8601 strings (the usual format of datetime attributes) are handled by
+    datetime.fromisoformat, which is much faster than dateutil's parser.
+
+    Args:
+        date_string: Date string in any format dateutil understands
+
+    Returns:
+        Parsed datetime
+
+    Raises:
+        ValueError: If the string can't be parsed
+    """
+    try:
+        return datetime.fromisoformat(date_string)
+    except ValueError:
+        return date_parser.parse(date_string)
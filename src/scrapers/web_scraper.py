@@ -3,14 +3,46 @@ Web scraper for AI news sources without RSS feeds.
 """
 
 import requests
-from bs4 import BeautifulSoup
-import time
+from cssselect import HTMLTranslator
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cached_property
 from typing import List, Dict, Optional
-from dateutil import parser as date_parser
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
-from config import USER_AGENT, REQUEST_TIMEOUT, REQUEST_DELAY
+from config import REQUEST_TIMEOUT
+from src.scrapers.rate_limiter import HostRateLimiter
+from src.scrapers.session import create_session
+from src.scrapers.utils import parse_date
+
+# Maximum number of pages fetched at the same time
+MAX_CONCURRENT_FETCHES = 8
+
+# Browser-like headers sent with page requests (on top of the session's User-Agent)
+PAGE_HEADERS = {
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1'
+}
+
+# Translates CSS selectors to XPath for the field extractors
+CSS_TRANSLATOR = HTMLTranslator()
+
+# Joins field values in the extractor's result (a private-use character pages rarely contain)
+FIELD_SEPARATOR = '\ue000'
+
+# Selectors used for fields a source doesn't configure
+DEFAULT_SELECTORS = {
+    'title': 'h2, h3',
+    'link': 'a',
+    'description': 'p',
+    'date': 'time'
+}
 
 
 class WebArticle:
@@ -33,6 +65,16 @@ class WebArticle:
         self.published = published
         self.source = source
 
+    @cached_property
+    def published_str(self) -> str:
+        """Publication date formatted for display, computed once on first use."""
+        return self.published.strftime('%b %d, %Y') if self.published else ""
+
+    @cached_property
+    def short_description(self) -> str:
+        """Description shortened to 200 characters for notifications, computed once on first use."""
+        return self.description[:197] + "..." if len(self.description) > 200 else self.description
+
     def to_dict(self) -> Dict:
         """Convert article to dictionary format."""
         return {
@@ -51,73 +93,115 @@ class WebArticle:
 class WebScraper:
     """Scrapes websites for AI news articles."""
 
-    def __init__(self):
-        """Initialize web scraper."""
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': USER_AGENT,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
-
-    def scrape_page(self, url: str, source_name: str, selectors: Dict) -> List[WebArticle]:
+    def __init__(self, session: Optional[requests.Session] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None):
+        """
+        Initialize web scraper.
+
+        Args:
+            session: Optional HTTP session to share with other scrapers
+            rate_limiter: Optional per-host rate limiter to share with other scrapers
+        """
+        self.session = session or create_session()
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        # Compiled article selectors, keyed by CSS selector string
+        self.selector_cache: Dict[str, CSSSelector] = {}
+        # Compiled field extractors, keyed by the source's field selectors
+        self.extractor_cache: Dict[tuple, tuple[etree.XPath, List[tuple[str, int]]]] = {}
+
+    def scrape_page(self, url: str, source_name: str, selectors: Dict, etag: str = "", last_modified: str = "",
+                    source_id: str = "", state_manager=None) -> tuple[List[WebArticle], str, str]:
         """
         Scrape a single web page for articles.
 
+        If a state manager is given, parsing stops at the first article that
+        has already been seen, since pages list their newest articles first.
+
         Args:
             url: Page URL
             source_name: Name of the source
             selectors: Dictionary of CSS selectors for finding elements
+            etag: Optional ETag for conditional GET
+            last_modified: Optional Last-Modified for conditional GET
+            source_id: Source identifier used for seen-entry lookups
+            state_manager: Optional state manager for stopping at seen articles
 
         Returns:
-            List of WebArticle objects
+            Tuple of (WebArticle list, new_etag, new_last_modified)
         """
         articles = []
+        new_etag = ""
+        new_last_modified = ""
 
         try:
+            # Be respectful - wait for our turn on this host
+            self.rate_limiter.acquire(urlparse(url).netloc)
+
             print(f"Fetching web page: {url}")
 
-            # Fetch page
-            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+            # Fetch page with conditional GET support
+            headers = dict(PAGE_HEADERS)
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+            response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+
+            # Skip parsing entirely if the page hasn't changed (304 = not modified)
+            if response.status_code == 304:
+                print("  Page not modified since last check (304)")
+                return articles, etag, last_modified
+
             response.raise_for_status()
 
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # New ETag and Last-Modified are only handed back once the page has been parsed,
+            # so a page whose selectors don't match yet keeps being re-fetched in full
+            response_etag = response.headers.get('ETag', '')
+            response_last_modified = response.headers.get('Last-Modified', '')
+
+            # Parse HTML in the page's encoding; lxml would otherwise assume Latin-1
+            # for pages without a <meta charset>
+            tree = lxml_html.fromstring(
+                response.content, parser=lxml_html.HTMLParser(encoding=self._page_encoding(response))
+            )
+            extractor = self._compile_extractor(selectors)
 
             # Find article elements
             article_selector = selectors.get('article', 'article')
-            article_elements = soup.select(article_selector)
+            article_elements = self._compile_article_selector(selectors)(tree)
 
             if not article_elements:
                 print(f"  Warning: No articles found with selector '{article_selector}'")
-                return articles
+                return articles, new_etag, new_last_modified
 
             print(f"  Found {len(article_elements)} article elements")
 
             # Parse each article
             for article_elem in article_elements[:20]:  # Limit to first 20 to avoid spam
                 try:
-                    # Extract title
-                    title = self._extract_text(article_elem, selectors.get('title', 'h2, h3'))
-                    if not title:
-                        continue
+                    # Pull every field out of the article with a single XPath evaluation
+                    fields = self._extract_fields(article_elem, extractor)
 
-                    # Extract link
-                    link = self._extract_link(article_elem, selectors.get('link', 'a'), url)
+                    # Extract link first - it identifies the article
+                    link = self._extract_link(fields['link'], url)
                     if not link:
                         continue
 
+                    # Everything from here on was already seen on a previous run
+                    if state_manager is not None and state_manager.is_seen(source_id, link.strip()):
+                        print("  Reached previously seen article, stopping")
+                        break
+
+                    # Extract title
+                    title = self._extract_text(fields['title'])
+                    if not title:
+                        continue
+
                     # Extract description
-                    description = self._extract_text(article_elem, selectors.get('description', 'p'))
-                    if description and len(description) > 300:
-                        description = description[:297] + "..."
+                    description = self._extract_text(fields['description'], max_length=300)
 
                     # Extract date
-                    published = self._extract_date(article_elem, selectors.get('date', 'time'))
+                    published = self._extract_date(fields['date'])
 
                     # Create article object
                     article = WebArticle(
@@ -134,101 +218,178 @@ class WebScraper:
                     continue
 
             print(f"  Successfully parsed {len(articles)} articles")
+            new_etag = response_etag
+            new_last_modified = response_last_modified
 
         except requests.RequestException as e:
             print(f"  Error fetching web page {url}: {e}")
         except Exception as e:
             print(f"  Error parsing web page {url}: {e}")
 
-        # Be respectful - add delay between requests
-        time.sleep(REQUEST_DELAY)
+        return articles, new_etag, new_last_modified
 
-        return articles
+    def _page_encoding(self, response: requests.Response) -> str:
+        """
+        Work out which encoding a page's body uses.
+
+        Args:
+            response: Page response
 
-    def _extract_text(self, element, selector: str) -> str:
+        Returns:
+            Charset from the Content-Type header, or one detected from the body
         """
-        Extract text from element using CSS selector.
+        # requests reports ISO-8859-1 for any text/* response without a charset, so
+        # only trust response.encoding when the header actually names one
+        if 'charset' in response.headers.get('Content-Type', '').lower():
+            return response.encoding
+        return response.apparent_encoding
+
+    def _compile_article_selector(self, selectors: Dict) -> CSSSelector:
+        """
+        Compile a source's article selector, caching the result.
 
         Args:
-            element: BeautifulSoup element to search within
-            selector: CSS selector string (can be comma-separated)
+            selectors: Dictionary of CSS selectors for finding elements
+
+        Returns:
+            Compiled selector matching article elements in document order
+        """
+        selector = selectors.get('article', 'article')
+        compiled = self.selector_cache.get(selector)
+        if compiled is None:
+            compiled = CSSSelector(selector, translator='html')
+            self.selector_cache[selector] = compiled
+        return compiled
+
+    def _compile_extractor(self, selectors: Dict) -> tuple[etree.XPath, List[tuple[str, int]]]:
+        """
+        Compile a source's field selectors into a single XPath expression.
+
+        Evaluated on an article element, the expression returns the values of
+        every field (title text, link href, description text, date attribute
+        and text) for the first match of each comma-separated selector part,
+        joined by FIELD_SEPARATOR, so all fields come back from one call.
+
+        Args:
+            selectors: Dictionary of CSS selectors for finding elements
+
+        Returns:
+            Tuple of (compiled XPath, list of (field, number of values) in result order)
+        """
+        key = tuple(selectors.get(field, default) for field, default in DEFAULT_SELECTORS.items())
+        cached = self.extractor_cache.get(key)
+        if cached is not None:
+            return cached
+
+        expressions = []
+        layout = []
+        for field, selector in zip(DEFAULT_SELECTORS, key):
+            parts = [sel.strip() for sel in selector.split(',')]
+            for part in parts:
+                first_match = f"({CSS_TRANSLATOR.css_to_xpath(part, prefix='descendant-or-self::')})[1]"
+                if field == 'link':
+                    expressions.append(f"string({first_match}/@href)")
+                elif field == 'date':
+                    expressions.append(f"string({first_match}/@datetime)")
+                    expressions.append(f"normalize-space({first_match})")
+                else:
+                    expressions.append(f"normalize-space({first_match})")
+            layout.append((field, len(parts) * (2 if field == 'date' else 1)))
+
+        separator = f", '{FIELD_SEPARATOR}', "
+        extractor = (etree.XPath(f"concat({separator.join(expressions)})"), layout)
+        self.extractor_cache[key] = extractor
+        return extractor
+
+    def _extract_fields(self, element, extractor: tuple[etree.XPath, List[tuple[str, int]]]) -> Dict[str, List[str]]:
+        """
+        Extract the raw values of every field from an article element.
+
+        Args:
+            element: lxml article element
+            extractor: Compiled extractor from _compile_extractor
+
+        Returns:
+            Dictionary mapping each field to its values, one per selector part
+            in priority order ('' where nothing matched); dates have an
+            attribute value and a text value per part
+
+        Raises:
+            ValueError: If a value contains FIELD_SEPARATOR, so the values can't be told apart
+        """
+        xpath, layout = extractor
+        values = xpath(element).split(FIELD_SEPARATOR)
+        if len(values) != sum(count for _, count in layout):
+            raise ValueError("article text contains the field separator")
+
+        fields = {}
+        start = 0
+        for field, count in layout:
+            fields[field] = values[start:start + count]
+            start += count
+        return fields
+
+    def _extract_text(self, values: List[str], max_length: int = 0) -> str:
+        """
+        Pick the text for a field.
+
+        Args:
+            values: Text of the first match for each selector part, in priority order
+            max_length: Truncate longer text to this length with "..." (0 = no limit)
 
         Returns:
             Extracted text or empty string
         """
-        try:
-            # Try each selector in the comma-separated list
-            for sel in selector.split(','):
-                sel = sel.strip()
-                found = element.select_one(sel)
-                if found:
-                    text = found.get_text(strip=True)
-                    if text:
-                        return text
-        except Exception as e:
-            print(f"  Warning: Error extracting text with selector '{selector}': {e}")
+        # Use the first selector that matched something with text
+        for value in values:
+            text = ' '.join(value.split())
+            if max_length and len(text) > max_length:
+                return text[:max_length - 3] + "..."
+            if text:
+                return text
 
         return ""
 
-    def _extract_link(self, element, selector: str, base_url: str) -> str:
+    def _extract_link(self, values: List[str], base_url: str) -> str:
         """
-        Extract link from element using CSS selector.
+        Pick the link for an article.
 
         Args:
-            element: BeautifulSoup element to search within
-            selector: CSS selector for link element
+            values: href of the first match for each selector part, in priority order
             base_url: Base URL for resolving relative links
 
         Returns:
             Absolute URL or empty string
         """
-        try:
-            # Try each selector in the comma-separated list
-            for sel in selector.split(','):
-                sel = sel.strip()
-                found = element.select_one(sel)
-                if found and found.get('href'):
-                    href = found.get('href')
-                    # Convert relative URLs to absolute
-                    return urljoin(base_url, href)
-        except Exception as e:
-            print(f"  Warning: Error extracting link with selector '{selector}': {e}")
+        # Use the first selector that matched an element with an href
+        for href in values:
+            if href:
+                # Most index pages already link absolutely, so skip urljoin's parsing for those
+                if href.startswith(('http://', 'https://')):
+                    return href
+                # Convert relative URLs to absolute
+                return urljoin(base_url, href)
 
         return ""
 
-    def _extract_date(self, element, selector: str) -> Optional[datetime]:
+    def _extract_date(self, values: List[str]) -> Optional[datetime]:
         """
-        Extract date from element using CSS selector.
+        Pick and parse the date for an article.
 
         Args:
-            element: BeautifulSoup element to search within
-            selector: CSS selector for date element
+            values: (datetime attribute, text) pairs for the first match of
+                each selector part, flattened, in priority order
 
         Returns:
             Parsed datetime or None
         """
-        try:
-            # Try each selector in the comma-separated list
-            for sel in selector.split(','):
-                sel = sel.strip()
-                found = element.select_one(sel)
-                if found:
-                    # Try datetime attribute first
-                    if found.get('datetime'):
-                        try:
-                            return date_parser.parse(found.get('datetime'))
-                        except:
-                            pass
-
-                    # Try text content
-                    date_text = found.get_text(strip=True)
-                    if date_text:
-                        try:
-                            return date_parser.parse(date_text)
-                        except:
-                            pass
-        except Exception as e:
-            print(f"  Warning: Error extracting date with selector '{selector}': {e}")
+        # Try the datetime attribute first, then the text content, for each selector
+        for date_string in values:
+            if date_string:
+                try:
+                    return parse_date(date_string)
+                except (ValueError, OverflowError):
+                    pass
 
         return None
 
@@ -237,7 +398,7 @@ class WebScraper:
         Scrape multiple web sources.
 
         Args:
-            sources: Dictionary of source configurations
+            sources: Dictionary of web source configurations (see config.WEB_CONFIGS)
             state_manager: State manager instance for tracking seen entries
 
         Returns:
@@ -245,27 +406,49 @@ class WebScraper:
         """
         all_new_articles = []
 
+        # Collect every page to fetch
+        pages = []
         for source_id, source_config in sources.items():
-            if source_config.get("type") != "web":
-                continue
-
-            source_name = source_config["name"]
-            selectors = source_config.get("selectors", {})
-
             for url in source_config["urls"]:
-                # Scrape page
-                articles = self.scrape_page(url, source_name, selectors)
-
-                # Filter out seen articles
-                new_articles = []
-                for article in articles:
-                    article_id = article.get_id()
-                    if not state_manager.is_seen(source_id, article_id):
-                        new_articles.append(article)
-                        state_manager.mark_seen(source_id, article_id)
-
-                if new_articles:
-                    print(f"  {len(new_articles)} new articles from {source_name}")
-                    all_new_articles.extend(new_articles)
+                state_key = f"{source_id}_{url}"
+                pages.append((
+                    source_id,
+                    source_config["name"],
+                    url,
+                    source_config.get("selectors", {}),
+                    state_manager.get_etag(state_key),
+                    state_manager.get_last_modified(state_key)
+                ))
+
+        if not pages:
+            return all_new_articles
+
+        # Fetch pages concurrently; the rate limiter keeps requests to the same host spaced out.
+        # Every page is scraped before anything is marked as seen, so a worker can't stop early
+        # on an article this run only just marked from another page of the same source
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_FETCHES, len(pages))) as executor:
+            results = list(executor.map(
+                lambda page: self.scrape_page(page[2], page[1], page[3], page[4], page[5], page[0], state_manager),
+                pages
+            ))
+
+        # State is updated here in the original source order; StateManager locks its own
+        # access because the RSS scraper runs alongside this one on another thread
+        for (source_id, source_name, url, _, _, _), (articles, new_etag, new_last_modified) in zip(pages, results):
+            # Update ETag and Last-Modified in state
+            if new_etag:
+                state_manager.set_etag(f"{source_id}_{url}", new_etag)
+            if new_last_modified:
+                state_manager.set_last_modified(f"{source_id}_{url}", new_last_modified)
+
+            # Filter out seen articles (the first article wins for duplicate IDs)
+            articles_by_id = {}
+            for article in articles:
+                articles_by_id.setdefault(article.get_id(), article)
+            new_articles = [articles_by_id[article_id] for article_id in state_manager.filter_new(source_id, articles_by_id)]
+
+            if new_articles:
+                print(f"  {len(new_articles)} new articles from {source_name}")
+                all_new_articles.extend(new_articles)
 
         return all_new_articles
@@ -4,22 +4,97 @@ Slack notifier for sending AI news updates.
 
 import requests
 import json
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Union
+from typing import List, Dict, Optional, Union
 from collections import defaultdict
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Slack rejects messages with more blocks than this
+MAX_BLOCKS_PER_MESSAGE = 50
+
+# Maximum number of webhooks posted to at the same time
+MAX_CONCURRENT_SENDS = 4
+
+# Retry policy for webhook posts: exponential backoff with jitter
+MAX_SEND_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+RETRY_JITTER = 0.5
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Sort key stand-in for entries without a publication date
+_DATETIME_MIN = datetime.min
+
+
+# Footer text shown at the end of every digest
+FOOTER_TEXT = "_Updates delivered by AI News Bot_ 🤖"
+
+# Block Kit JSON fragments; blocks are kept pre-encoded and spliced into the payload as bytes
+_SECTION_PREFIX = b'{"type":"section","text":{"type":"mrkdwn","text":'
+_SECTION_SUFFIX = b'}}'
+_CONTEXT_PREFIX = b'{"type":"context","elements":['
+_CONTEXT_SUFFIX = b']}'
+_MRKDWN_PREFIX = b'{"type":"mrkdwn","text":'
+_MRKDWN_SUFFIX = b'}'
+_PAYLOAD_PREFIX = b'{"blocks":['
+_PAYLOAD_SUFFIX = b']}'
+
+
+def _json_str(text: str) -> bytes:
+    """Encode a string as a JSON string literal in UTF-8, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(text)
+    return json.dumps(text, ensure_ascii=False).encode('utf-8')
+
+
+def _published_key(entry) -> datetime:
+    """Sort key for entries by publication date, treating undated entries as oldest."""
+    return entry.published or _DATETIME_MIN
+
 
 class SlackNotifier:
-    """Sends formatted messages to Slack via webhook."""
+    """Sends formatted messages to one or more Slack webhooks."""
 
-    def __init__(self, webhook_url: str):
+    _DIVIDER = b'{"type":"divider"}'
+
+    def __init__(self, webhook_urls: Union[str, List[str]], session: requests.Session = None):
         """
         Initialize Slack notifier.
 
         Args:
-            webhook_url: Slack webhook URL
+            webhook_urls: Slack webhook URL, or a list of them to post every message to
+            session: Optional HTTP session to send with (one is created if not given)
+
+        Raises:
+            ValueError: If no webhook URL is given
         """
-        self.webhook_url = webhook_url
+        self.webhook_urls = [webhook_urls] if isinstance(webhook_urls, str) else list(webhook_urls)
+        if not self.webhook_urls:
+            raise ValueError("At least one Slack webhook URL is required")
+        # Reuse one keep-alive connection to Slack across all sends
+        self._owns_session = session is None
+        self._session = session if session is not None else requests.Session()
+
+    def close(self):
+        """Close the HTTP session if this notifier created it."""
+        if self._owns_session:
+            self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def send_updates(self, entries: List) -> bool:
         """
@@ -32,89 +107,92 @@ class SlackNotifier:
             True if successful, False otherwise
         """
         if not entries:
-            print("No new entries to send to Slack")
+            logger.info("No new entries to send to Slack")
             return True
 
-        # Sort entries by date (newest first)
-        sorted_entries = sorted(
-            entries,
-            key=lambda x: x.published if x.published else datetime.min,
-            reverse=True
-        )
-
-        # Group entries by source
+        # Group entries by source, then sort each group by date (newest first)
         entries_by_source = defaultdict(list)
-        for entry in sorted_entries:
+        for entry in entries:
             entries_by_source[entry.source].append(entry)
+        for source_entries in entries_by_source.values():
+            source_entries.sort(key=_published_key, reverse=True)
+
+        # Sources with the most recent updates come first
+        entries_by_source = dict(sorted(
+            entries_by_source.items(),
+            key=lambda item: _published_key(item[1][0]),
+            reverse=True
+        ))
 
         # Build Slack message
-        blocks = self._build_message_blocks(entries_by_source, len(sorted_entries))
+        today = datetime.utcnow().strftime("%B %d, %Y")
+        blocks = self._build_message_blocks(entries_by_source, len(entries), today)
 
         # Send to Slack
         return self._send_to_slack(blocks)
 
-    def _build_message_blocks(self, entries_by_source: Dict, total_count: int) -> List[Dict]:
+    @staticmethod
+    def _mrkdwn_section(text: str) -> bytes:
+        """
+        Build a section block holding Markdown text.
+
+        Args:
+            text: Slack mrkdwn text
+
+        Returns:
+            JSON-encoded Slack block
+        """
+        return b''.join((_SECTION_PREFIX, _json_str(text), _SECTION_SUFFIX))
+
+    @staticmethod
+    def _context_block(*texts: str) -> bytes:
+        """
+        Build a context block with one Markdown element per text.
+
+        Args:
+            texts: Slack mrkdwn texts
+
+        Returns:
+            JSON-encoded Slack block
+        """
+        elements = b','.join(b''.join((_MRKDWN_PREFIX, _json_str(text), _MRKDWN_SUFFIX)) for text in texts)
+        return b''.join((_CONTEXT_PREFIX, elements, _CONTEXT_SUFFIX))
+
+    def _build_message_blocks(self, entries_by_source: Dict, total_count: int, today: str) -> List[bytes]:
         """
         Build Slack Block Kit message blocks.
 
         Args:
             entries_by_source: Dictionary mapping source names to entry lists
             total_count: Total number of entries
+            today: Date shown in the message header
 
         Returns:
-            List of Slack block dictionaries
+            List of JSON-encoded Slack blocks
         """
         blocks = []
 
         # Header
-        today = datetime.utcnow().strftime("%B %d, %Y")
         header_text = f"🤖 *AI News Update - {today}*\n_{total_count} new update{'s' if total_count != 1 else ''} found_"
 
-        blocks.append({
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": header_text
-            }
-        })
-
-        blocks.append({"type": "divider"})
+        blocks.append(self._mrkdwn_section(header_text))
+        blocks.append(self._DIVIDER)
 
         # Add entries grouped by source
         for source_name, entries in entries_by_source.items():
             # Source header
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*{source_name}* ({len(entries)} update{'s' if len(entries) != 1 else ''})"
-                }
-            })
+            blocks.append(self._mrkdwn_section(
+                f"*{source_name}* ({len(entries)} update{'s' if len(entries) != 1 else ''})"
+            ))
 
             # Add each entry
-            for entry in entries:
-                entry_text = self._format_entry(entry)
-                blocks.append({
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": entry_text
-                    }
-                })
+            blocks.extend(self._mrkdwn_section(self._format_entry(entry)) for entry in entries)
 
             # Divider between sources
-            blocks.append({"type": "divider"})
+            blocks.append(self._DIVIDER)
 
         # Footer
-        blocks.append({
-            "type": "context",
-            "elements": [
-                {
-                    "type": "mrkdwn",
-                    "text": "_Updates delivered by AI News Bot_ 🤖"
-                }
-            ]
-        })
+        blocks.append(self._context_block(FOOTER_TEXT))
 
         return blocks
 
@@ -128,69 +206,155 @@ class SlackNotifier:
         Returns:
             Formatted Markdown string
         """
-        # Format date
-        date_str = ""
-        if entry.published:
-            date_str = f" • {entry.published.strftime('%b %d, %Y')}"
-
         # Build entry text
-        text_parts = [
-            f"• *<{entry.link}|{entry.title}>*{date_str}"
-        ]
+        parts = ["• *<", entry.link, "|", entry.title, ">*"]
+        if entry.published_str:
+            parts.extend((" • ", entry.published_str))
 
         if entry.description:
-            # Truncate description if too long
-            desc = entry.description
-            if len(desc) > 200:
-                desc = desc[:197] + "..."
-            text_parts.append(f"  _{desc}_")
+            parts.extend(("\n  _", entry.short_description, "_"))
+
+        return "".join(parts)
+
+    def _send_to_slack(self, blocks: List[bytes]) -> bool:
+        """
+        Send message blocks to every Slack webhook.
+
+        Messages over Slack's block limit are split into several parts, which
+        are posted to each webhook one after another so they appear in order.
+        Different webhooks are posted to concurrently.
+
+        Args:
+            blocks: List of JSON-encoded Slack blocks
+
+        Returns:
+            True if every part reached every webhook, False otherwise
+        """
+        if len(blocks) <= MAX_BLOCKS_PER_MESSAGE:
+            chunks = [blocks]
+        else:
+            chunks = self._split_blocks(blocks)
+            logger.info("Message has %d blocks, sending it in %d parts", len(blocks), len(chunks))
+
+        # Blocks are already encoded, so each payload is just spliced together, once per part
+        bodies = [b''.join((_PAYLOAD_PREFIX, b','.join(chunk), _PAYLOAD_SUFFIX)) for chunk in chunks]
+
+        if len(self.webhook_urls) == 1:
+            return self._post_parts(self.webhook_urls[0], bodies)
+
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_SENDS, len(self.webhook_urls))) as executor:
+            results = list(executor.map(lambda webhook_url: self._post_parts(webhook_url, bodies), self.webhook_urls))
+
+        return all(results)
+
+    def _post_parts(self, webhook_url: str, bodies: List[bytes]) -> bool:
+        """
+        Post the parts of a message to one webhook, in order.
+
+        Each part retries on its own; a part that still fails doesn't stop the
+        remaining parts from being sent.
+
+        Args:
+            webhook_url: Slack webhook URL
+            bodies: JSON-encoded message payloads, in the order they should appear
 
-        return "\n".join(text_parts)
+        Returns:
+            True if every part was sent successfully, False otherwise
+        """
+        results = [self._post_payload(webhook_url, body) for body in bodies]
+        return all(results)
 
-    def _send_to_slack(self, blocks: List[Dict]) -> bool:
+    def _split_blocks(self, blocks: List[bytes]) -> List[List[bytes]]:
         """
-        Send message blocks to Slack webhook.
+        Split a digest into parts that each fit in one Slack message.
+
+        Every part repeats the header and divider, and ends with a context block
+        saying which part it is. The last part also carries the original footer.
 
         Args:
-            blocks: List of Slack block dictionaries
+            blocks: Digest blocks, as built by _build_message_blocks
+
+        Returns:
+            List of block lists, one per message
+        """
+        # The original footer is dropped here and re-added to the last part's context
+        header, body = blocks[:2], blocks[2:-1]
+        per_chunk = MAX_BLOCKS_PER_MESSAGE - len(header) - 1
+        parts = [body[i:i + per_chunk] for i in range(0, len(body), per_chunk)]
+
+        chunks = []
+        for number, part in enumerate(parts, 1):
+            if number < len(parts):
+                context = self._context_block(f"_Continued in next message… (part {number} of {len(parts)})_")
+            else:
+                context = self._context_block(f"_Part {number} of {len(parts)}_", FOOTER_TEXT)
+            chunks.append(header + part + [context])
+
+        return chunks
+
+    def _post_payload(self, webhook_url: str, body: bytes) -> bool:
+        """
+        Post a single message to a Slack webhook, retrying transient failures.
+
+        Args:
+            webhook_url: Slack webhook URL
+            body: JSON-encoded message payload (at most MAX_BLOCKS_PER_MESSAGE blocks)
 
         Returns:
             True if successful, False otherwise
         """
-        # Slack has a limit on message size, so we may need to split
-        # For now, we'll send all blocks (up to ~50 blocks is usually safe)
-        if len(blocks) > 50:
-            print(f"Warning: Message has {len(blocks)} blocks, may exceed Slack limits")
-            # Keep header, divider, and footer, truncate middle
-            blocks = blocks[:3] + blocks[3:47] + [
-                {
-                    "type": "section",
-                    "text": {
-                        "type": "mrkdwn",
-                        "text": "_... and more updates. Check the sources for complete list._"
-                    }
-                }
-            ] + blocks[-2:]
-
-        payload = {
-            "blocks": blocks
-        }
-
-        try:
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=10
-            )
-            response.raise_for_status()
-
-            print(f"✓ Successfully sent update to Slack")
-            return True
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            retry_after = None
+            try:
+                response = self._session.post(
+                    webhook_url,
+                    data=body,
+                    headers={"Content-Type": "application/json"},
+                    timeout=10
+                )
+                response.raise_for_status()
+
+                logger.info("Sent update to Slack")
+                return True
+
+            except requests.HTTPError as e:
+                error = e
+                # Client errors (bad payload, revoked webhook) won't succeed on retry
+                if e.response.status_code not in RETRYABLE_STATUS_CODES:
+                    break
+                retry_after = e.response.headers.get("Retry-After")
+
+            except requests.RequestException as e:
+                error = e
+
+            if attempt < MAX_SEND_ATTEMPTS:
+                delay = self._retry_delay(attempt, retry_after)
+                logger.warning("Slack request failed (%s), retrying in %.1fs", error, delay)
+                time.sleep(delay)
+
+        logger.error("Could not send message to Slack: %s", error)
+        return False
+
+    def _retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Work out how long to wait before the next send attempt.
+
+        Args:
+            attempt: Number of the attempt that just failed (starting at 1)
+            retry_after: Retry-After header from the response, if any
+
+        Returns:
+            Delay in seconds
+        """
+        # Slack says how long to back off when rate limiting; still cap it so the job can't stall
+        if retry_after:
+            try:
+                return min(RETRY_MAX_DELAY, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
 
-        except requests.RequestException as e:
-            print(f"✗ Error sending message to Slack: {e}")
-            return False
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** (attempt - 1)))
+        return delay * (1 + random.random() * RETRY_JITTER)
 
     def send_error_notification(self, error_message: str) -> bool:
         """
@@ -202,14 +366,6 @@ class SlackNotifier:
         Returns:
             True if successful, False otherwise
         """
-        blocks = [
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"⚠️ *AI News Bot Error*\n```{error_message}```"
-                }
-            }
-        ]
+        blocks = [self._mrkdwn_section(f"⚠️ *AI News Bot Error*\n```{error_message}```")]
 
         return self._send_to_slack(blocks)
@@ -2,40 +2,221 @@
 State manager for tracking scraped entries and preventing duplicates.
 """
 
+import base64
+import hashlib
 import json
+import logging
 import os
+import threading
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from typing import Dict, List, Set
+from functools import partial
+from typing import Dict, Iterable, Iterator, List
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# State files with this suffix are zstd-compressed JSON
+ZSTD_SUFFIX = ".zst"
+ZSTD_LEVEL = 3
+
+# Seen entry IDs are only used for membership checks, so just a short digest of each is kept
+ID_DIGEST_SIZE = 8
+
+
+def _hash_id(entry_id: str) -> bytes:
+    """Hash an entry ID down to a fixed-size digest."""
+    return hashlib.blake2b(entry_id.encode('utf-8'), digest_size=ID_DIGEST_SIZE).digest()
+
+
+def _unpack_digests(packed: str) -> List[bytes]:
+    """Decode a base64 string of concatenated digests, raising ValueError if it is malformed."""
+    data = base64.b64decode(packed, validate=True)
+    if len(data) % ID_DIGEST_SIZE:
+        raise ValueError(f"packed digests are {len(data)} bytes, not a multiple of {ID_DIGEST_SIZE}")
+    return [data[i:i + ID_DIGEST_SIZE] for i in range(0, len(data), ID_DIGEST_SIZE)]
+
+
+def _pack_digests(digests: Iterable[bytes]) -> str:
+    """Encode digests as a single base64 string of their concatenation."""
+    return base64.b64encode(b''.join(digests)).decode('ascii')
+
+
+def _compress(data: bytes) -> bytes:
+    """Compress bytes with zstd."""
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+
+def _decompress(data: bytes) -> bytes:
+    """Decompress zstd bytes, raising ValueError on corrupt data."""
+    try:
+        # Streaming decompression also handles frames that don't record their content size
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    except zstandard.ZstdError as e:
+        raise ValueError(f"Invalid zstd data: {e}") from e
+
+
+def _loads(data: bytes) -> Dict:
+    """Parse JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode('utf-8'))
+
+
+def _dumps(obj: Dict) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        # orjson writes UTF-8 directly, matching json's ensure_ascii=False output without the re-encode
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+class _SeenEntries:
+    """
+    Bounded set of entry digests, ordered from least to most recently seen.
+
+    Seeing a digest again moves it to the most recent end, so entries that are
+    still listed by a source are never the first to be evicted once the cap is
+    reached; the oldest digests that stopped appearing go first.
+    """
+
+    __slots__ = ("entries", "maxlen")
+
+    def __init__(self, digests: Iterable[bytes] = (), maxlen: int = None):
+        self.entries = OrderedDict()
+        self.maxlen = maxlen
+        self.update(digests)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return digest in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.entries)
+
+    def update(self, digests: Iterable[bytes]) -> List[bool]:
+        """
+        Record a batch of digests as seen, least recent first.
+
+        The whole batch is checked before anything is evicted, so a batch can
+        never push out its own members and make them look new.
+
+        Args:
+            digests: Digests to record, least recent first
+
+        Returns:
+            One flag per digest, True where the digest had not been seen before
+        """
+        digests = list(digests)
+        is_new = [digest not in self.entries for digest in digests]
+
+        for digest in digests:
+            self.entries[digest] = None
+            self.entries.move_to_end(digest)
+
+        if self.maxlen is not None:
+            while len(self.entries) > self.maxlen:
+                self.entries.popitem(last=False)
+
+        return is_new
+
+    def add(self, digest: bytes) -> bool:
+        """
+        Record a single digest as seen, evicting the oldest one if full.
+
+        Returns:
+            True if the digest was new, False if it was already present
+        """
+        return self.update((digest,))[0]
 
 
 class StateManager:
     """Manages state file for tracking seen entries."""
 
-    def __init__(self, state_file: str = "state.json"):
+    def __init__(self, state_file: str = "state.json.zst", max_entries_per_source: int = 100):
         """
         Initialize state manager.
 
         Args:
-            state_file: Path to the state JSON file
+            state_file: Path to the state JSON file (zstd-compressed if it ends in .zst)
+            max_entries_per_source: Maximum number of seen entries remembered per source;
+                the oldest are forgotten first
         """
+        if state_file.endswith(ZSTD_SUFFIX) and zstandard is None:
+            state_file = state_file[:-len(ZSTD_SUFFIX)]
+            logger.warning("zstandard is not installed, using uncompressed %s", state_file)
         self.state_file = state_file
+        self._compressed = state_file.endswith(ZSTD_SUFFIX)
+        self.max_entries_per_source = max_entries_per_source
+        # The RSS and web scrapers share this manager from separate threads, and web
+        # workers check it while pages are fetched, so all state access goes through this lock
+        self._lock = threading.Lock()
+        # Set whenever the in-memory state diverges from what is on disk
+        self._dirty = False
         self.state = self._load_state()
+        # Sources get an empty, capped set of seen entries on first write
+        self.state["seen_entries"] = defaultdict(
+            partial(_SeenEntries, maxlen=max_entries_per_source), self.state["seen_entries"]
+        )
 
     def _load_state(self) -> Dict:
         """
         Load state from file or create new state if file doesn't exist.
 
+        A compressed state file that doesn't exist yet is seeded from the
+        uncompressed file of the same name, if there is one.
+
         Returns:
             State dictionary
         """
-        if os.path.exists(self.state_file):
+        path = self.state_file
+        compressed = self._compressed
+        if compressed and not os.path.exists(path):
+            legacy_file = path[:-len(ZSTD_SUFFIX)]
+            if os.path.exists(legacy_file):
+                logger.info("Migrating state from %s to %s", legacy_file, path)
+                path = legacy_file
+                compressed = False
+                self._dirty = True
+
+        if os.path.exists(path):
             try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Warning: Could not load state file: {e}. Creating new state.")
+                with open(path, 'rb') as f:
+                    data = f.read()
+                state = _loads(_decompress(data) if compressed else data)
+
+                # Seen entries are stored as packed digests but kept in memory as bounded
+                # ordered sets, which give O(1) membership and drop the least recently seen entries on their own
+                seen_entries = {}
+                for source, entries in state.get("seen_entries", {}).items():
+                    if isinstance(entries, list):
+                        # Older state files list the full IDs; hash them and rewrite on save
+                        digests = [_hash_id(entry_id) for entry_id in entries]
+                        self._dirty = True
+                    else:
+                        digests = _unpack_digests(entries)
+                    seen_entries[source] = _SeenEntries(digests, self.max_entries_per_source)
+                    if len(seen_entries[source]) < len(digests):
+                        self._dirty = True
+                state["seen_entries"] = seen_entries
+                return state
+            except (ValueError, TypeError, IOError) as e:
+                logger.warning("Could not load state file: %s. Creating new state.", e)
+                self._dirty = True
                 return self._create_new_state()
         else:
+            self._dirty = True
             return self._create_new_state()
 
     def _create_new_state(self) -> Dict:
@@ -53,14 +234,41 @@ class StateManager:
         }
 
     def save_state(self):
-        """Save current state to file."""
-        self.state["last_checked"] = datetime.utcnow().isoformat() + "Z"
+        """
+        Save current state to file.
 
-        try:
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(self.state, f, indent=2, ensure_ascii=False)
-        except IOError as e:
-            print(f"Error: Could not save state file: {e}")
+        The file is only rewritten when something changed since it was loaded;
+        otherwise just its modification time is bumped. Writes go to a temporary
+        file that then replaces the state file, so an interrupted run can't leave
+        it half-written.
+        """
+        with self._lock:
+            if not self._dirty:
+                try:
+                    os.utime(self.state_file, None)
+                except OSError as e:
+                    logger.warning("Could not touch state file: %s", e)
+                return
+
+            self.state["last_checked"] = datetime.utcnow().isoformat() + "Z"
+
+            state = dict(self.state)
+            state["seen_entries"] = {
+                source: _pack_digests(entries) for source, entries in self.state["seen_entries"].items()
+            }
+
+            data = _dumps(state)
+            if self._compressed:
+                data = _compress(data)
+
+            tmp_file = self.state_file + ".tmp"
+            try:
+                with open(tmp_file, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_file, self.state_file)
+                self._dirty = False
+            except IOError as e:
+                logger.error("Could not save state file: %s", e)
 
     def is_seen(self, source: str, entry_id: str) -> bool:
         """
@@ -73,10 +281,9 @@ class StateManager:
         Returns:
             True if entry has been seen, False otherwise
         """
-        if source not in self.state["seen_entries"]:
-            self.state["seen_entries"][source] = []
-
-        return entry_id in self.state["seen_entries"][source]
+        with self._lock:
+            # .get() rather than indexing, so checks (also made from scraper threads) never add sources
+            return _hash_id(entry_id) in self.state["seen_entries"].get(source, ())
 
     def mark_seen(self, source: str, entry_id: str):
         """
@@ -86,13 +293,33 @@ class StateManager:
             source: Source identifier
             entry_id: Unique entry identifier
         """
-        if source not in self.state["seen_entries"]:
-            self.state["seen_entries"][source] = []
+        with self._lock:
+            if self.state["seen_entries"][source].add(_hash_id(entry_id)):
+                self._dirty = True
 
-        if entry_id not in self.state["seen_entries"][source]:
-            self.state["seen_entries"][source].append(entry_id)
+    def filter_new(self, source: str, entry_ids: Iterable[str]) -> List[str]:
+        """
+        Return the entries that have not been seen before and mark them as seen.
 
-    def get_seen_entries(self, source: str) -> List[str]:
+        Args:
+            source: Source identifier
+            entry_ids: Unique entry identifiers, in the order they were found
+
+        Returns:
+            Previously unseen entry IDs, deduplicated and in their original order
+        """
+        with self._lock:
+            # Sources list their newest entries first; record them oldest first so the
+            # newest end up most recent. Already seen entries are refreshed, not just skipped
+            entry_ids = list(dict.fromkeys(entry_ids))[::-1]
+            is_new = self.state["seen_entries"][source].update(_hash_id(entry_id) for entry_id in entry_ids)
+            new_ids = [entry_id for entry_id, new in zip(entry_ids, is_new) if new][::-1]
+
+            if new_ids:
+                self._dirty = True
+            return new_ids
+
+    def get_seen_entries(self, source: str) -> List[bytes]:
         """
         Get list of seen entries for a source.
 
@@ -100,9 +327,10 @@ class StateManager:
             source: Source identifier
 
         Returns:
-            List of seen entry IDs
+            List of seen entry ID digests, oldest first
         """
-        return self.state["seen_entries"].get(source, [])
+        with self._lock:
+            return list(self.state["seen_entries"].get(source, ()))
 
     def get_etag(self, source: str) -> str:
         """
@@ -114,7 +342,8 @@ class StateManager:
         Returns:
             ETag value or empty string
         """
-        return self.state["etags"].get(source, "")
+        with self._lock:
+            return self.state["etags"].get(source, "")
 
     def set_etag(self, source: str, etag: str):
         """
@@ -124,7 +353,10 @@ class StateManager:
             source: Source identifier
             etag: ETag value
         """
-        self.state["etags"][source] = etag
+        with self._lock:
+            if self.state["etags"].get(source) != etag:
+                self.state["etags"][source] = etag
+                self._dirty = True
 
     def get_last_modified(self, source: str) -> str:
         """
@@ -136,7 +368,8 @@ class StateManager:
         Returns:
             Last-Modified value or empty string
         """
-        return self.state["last_modified"].get(source, "")
+        with self._lock:
+            return self.state["last_modified"].get(source, "")
 
     def set_last_modified(self, source: str, last_modified: str):
         """
@@ -146,18 +379,27 @@ class StateManager:
             source: Source identifier
             last_modified: Last-Modified value
         """
-        self.state["last_modified"][source] = last_modified
+        with self._lock:
+            if self.state["last_modified"].get(source) != last_modified:
+                self.state["last_modified"][source] = last_modified
+                self._dirty = True
 
     def cleanup_old_entries(self, max_entries_per_source: int = 100):
         """
-        Clean up old entries to prevent state file from growing too large.
+        Trim seen entries below the configured cap.
         Keeps only the most recent entries.
 
+        Seen entries are already capped at max_entries_per_source as they are
+        added, so this is only needed to shrink them further.
+
         Args:
             max_entries_per_source: Maximum number of entries to keep per source
         """
-        for source in self.state["seen_entries"]:
-            entries = self.state["seen_entries"][source]
-            if len(entries) > max_entries_per_source:
-                # Keep only the most recent entries
-                self.state["seen_entries"][source] = entries[-max_entries_per_source:]
+        with self._lock:
+            for source, entries in self.state["seen_entries"].items():
+                if len(entries) > max_entries_per_source:
+                    # Keep only the most recent entries
+                    self.state["seen_entries"][source] = _SeenEntries(
+                        list(entries)[-max_entries_per_source:], self.max_entries_per_source
+                    )
+                    self._dirty = True
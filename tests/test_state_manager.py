@@ -0,0 +1,114 @@
+"""
+Tests for seen-entry tracking in the state manager.
+
+Run with: python -m unittest discover tests
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import zstandard
+
+from src.state_manager import StateManager, _compress
+
+
+class SlidingFeedTest(unittest.TestCase):
+    """A feed that gains one item per run must report exactly that item as new."""
+
+    CAP = 200
+    RUNS = 300
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.tmpdir.name, "state.json.zst")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def run_feed(self, feed_size: int):
+        """Simulate daily runs of a feed listing its newest `feed_size` items, newest first."""
+        new_counts = []
+        for run in range(self.RUNS):
+            # The feed's newest item is number `run + feed_size`; one item drops off the end each run
+            feed = [f"https://example.com/{i}" for i in range(run + feed_size, run, -1)]
+
+            state_manager = StateManager(self.state_file, max_entries_per_source=self.CAP)
+            new_ids = state_manager.filter_new("feed", feed)
+            state_manager.save_state()
+
+            if run == 0:
+                self.assertEqual(new_ids, feed)
+            else:
+                new_counts.append(len(new_ids))
+                self.assertEqual(new_ids, feed[:1], f"run {run}")
+        return new_counts
+
+    def test_feed_as_large_as_cap(self):
+        self.assertEqual(set(self.run_feed(self.CAP)), {1})
+
+    def test_feed_smaller_than_cap(self):
+        self.assertEqual(set(self.run_feed(150)), {1})
+
+    def test_feed_larger_than_cap(self):
+        # Items beyond the cap can't all be remembered, but those still in the
+        # newest part of the feed must never come back as new
+        state_manager = StateManager(self.state_file, max_entries_per_source=self.CAP)
+        feed = [f"https://example.com/{i}" for i in range(250, 0, -1)]
+        state_manager.filter_new("feed", feed)
+        self.assertEqual(state_manager.filter_new("feed", feed[:self.CAP]), [])
+
+
+class SeenEntriesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.state_file = os.path.join(self.tmpdir.name, "state.json.zst")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_filter_new_keeps_order_and_dedupes(self):
+        state_manager = StateManager(self.state_file)
+        state_manager.mark_seen("feed", "b")
+        self.assertEqual(state_manager.filter_new("feed", ["a", "b", "c", "a"]), ["a", "c"])
+
+    def test_seen_again_is_refreshed(self):
+        state_manager = StateManager(self.state_file, max_entries_per_source=2)
+        state_manager.mark_seen("feed", "a")
+        state_manager.mark_seen("feed", "b")
+        state_manager.mark_seen("feed", "a")
+        state_manager.mark_seen("feed", "c")
+        self.assertTrue(state_manager.is_seen("feed", "a"))
+        self.assertFalse(state_manager.is_seen("feed", "b"))
+
+    def test_is_seen_does_not_add_source(self):
+        state_manager = StateManager(self.state_file)
+        self.assertFalse(state_manager.is_seen("feed", "a"))
+        self.assertNotIn("feed", state_manager.state["seen_entries"])
+
+    def test_load_frame_without_content_size(self):
+        state = {"seen_entries": {"feed": ["a"]}, "etags": {}, "last_modified": {}}
+        # Streamed frames, as written by the zstd CLI from a pipe, don't record their size
+        compressor = zstandard.ZstdCompressor().compressobj()
+        with open(self.state_file, "wb") as f:
+            f.write(compressor.compress(json.dumps(state).encode()) + compressor.flush())
+
+        state_manager = StateManager(self.state_file)
+        self.assertTrue(state_manager.is_seen("feed", "a"))
+
+    def test_corrupt_seen_entries_start_new_state(self):
+        # Not base64, and base64 that doesn't decode to whole digests
+        for packed in ("not base64!", "AAAA"):
+            state = {"seen_entries": {"feed": packed}, "etags": {}, "last_modified": {}}
+            with open(self.state_file, "wb") as f:
+                f.write(_compress(json.dumps(state).encode()))
+
+            with self.assertLogs("src.state_manager", level="WARNING"):
+                state_manager = StateManager(self.state_file)
+            self.assertEqual(dict(state_manager.state["seen_entries"]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()